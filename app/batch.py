@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, List, Sequence, TypeVar, Union
+
+log = logging.getLogger("scribbit.batch")
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+DEFAULT_MAX_CONCURRENCY = 20
+
+
+async def run_batch(
+    items: Sequence[T],
+    worker: Callable[[T], Awaitable[R]],
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    retries: int = 0,
+    backoff: float = 0.5,
+) -> List[Union[R, BaseException]]:
+    """
+    Run `worker` over `items` concurrently, at most `max_concurrency` at a time,
+    so per-item network latency overlaps instead of adding up.
+
+    - Results come back in input order.
+    - A failed item yields its exception in place of a result; it never
+      fails the whole batch.
+    - Failures are retried up to `retries` times with exponential backoff.
+      The semaphore is released while backing off.
+    """
+    sem = asyncio.Semaphore(max_concurrency)
+
+    async def one(item: T) -> R:
+        attempt = 0
+        while True:
+            try:
+                async with sem:
+                    return await worker(item)
+            except Exception as exc:
+                if attempt >= retries:
+                    raise
+                delay = backoff * (2 ** attempt)
+                attempt += 1
+                log.warning(
+                    "batch item failed (attempt %d/%d): %s; retrying in %.2fs",
+                    attempt,
+                    retries + 1,
+                    exc,
+                    delay,
+                )
+                await asyncio.sleep(delay)
+
+    return await asyncio.gather(*(one(i) for i in items), return_exceptions=True)
+
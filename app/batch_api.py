@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, List, Optional, Sequence
+
+import orjson
+
+from app.openai_client import chat_request_body, get_openai_client
+
+log = logging.getLogger("scribbit.batch_api")
+
+# ------------------------------------------------------------------------------
+# OpenAI Batch API helpers
+#
+# Bulk scorecards do not need an interactive answer. The Batch API runs them
+# at roughly half the cost, with higher rate limits, inside a 24h window.
+# ------------------------------------------------------------------------------
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+BATCH_COMPLETION_WINDOW = "24h"
+# Statuses after which the batch will not produce any more output
+BATCH_TERMINAL_STATUSES = frozenset({"completed", "failed", "expired", "cancelled"})
+
+
+class BatchAPIUnavailable(RuntimeError):
+    """
+    Raised when the OpenAI SDK or API key is not configured.
+    """
+
+
+def _require_client():
+    client = get_openai_client()
+    if client is None:
+        raise BatchAPIUnavailable("OpenAI API key is not configured.")
+    return client
+
+
+_RISK_PROMPT_HEADER = (
+    "Identify consumer-risk clauses (fees/FX, auto-renewal, arbitration, "
+    "data sharing, non-refundable payments, unilateral changes) in the "
+    "document below. Return JSON with a 'risks' array and "
+    "'detected_language'.\n\n"
+    "Document: "
+)
+
+
+def build_risk_prompt(doc_name: str, text: str) -> str:
+    return "".join((_RISK_PROMPT_HEADER, doc_name, "\n\n", text))
+
+
+def _build_jsonl(prompts: Sequence[str]) -> bytes:
+    """
+    One /v1/chat/completions request per line; custom_id is the prompt index.
+    """
+    return b"".join(
+        orjson.dumps(
+            {
+                "custom_id": str(i),
+                "method": "POST",
+                "url": BATCH_ENDPOINT,
+                "body": chat_request_body(prompt),
+            }
+        )
+        + b"\n"
+        for i, prompt in enumerate(prompts)
+    )
+
+
+def _parse_output_line(line: str) -> Dict[str, Any]:
+    row = orjson.loads(line)
+    response = row.get("response") or {}
+    body = response.get("body") or {}
+    error = row.get("error") or body.get("error")
+
+    content: Optional[str] = None
+    choices = body.get("choices") or []
+    if choices:
+        content = (choices[0].get("message") or {}).get("content")
+
+    return {
+        "index": int(row.get("custom_id", -1)),
+        "status_code": response.get("status_code", 500 if error else 200),
+        "content": content,
+        "tokens": (body.get("usage") or {}).get("total_tokens", 0),
+        "error": (error or {}).get("message") if isinstance(error, dict) else error,
+    }
+
+
+async def submit_batch(prompts: Sequence[str]) -> str:
+    """
+    Upload the prompts as a JSONL batch file and start a batch job.
+    Returns the batch id to poll with poll_batch().
+    """
+    client = _require_client()
+    upload = await client.files.create(
+        file=("scribbit-batch.jsonl", _build_jsonl(prompts)),
+        purpose="batch",
+    )
+    batch = await client.batches.create(
+        input_file_id=upload.id,
+        endpoint=BATCH_ENDPOINT,
+        completion_window=BATCH_COMPLETION_WINDOW,
+        metadata={"source": "scribbit-scorecard-bulk"},
+    )
+    log.info("submitted batch %s with %d prompts", batch.id, len(prompts))
+    return batch.id
+
+
+async def _read_output_file(client, file_id: str) -> List[Dict[str, Any]]:
+    rows = []
+    async with client.files.with_streaming_response.content(file_id) as resp:
+        async for line in resp.iter_lines():
+            if line:
+                rows.append(_parse_output_line(line))
+    return rows
+
+
+def _batch_error_message(batch) -> str:
+    errors = getattr(getattr(batch, "errors", None), "data", None) or []
+    if errors and errors[0].message:
+        return errors[0].message
+    return f"Batch {batch.status} before this request completed."
+
+
+async def poll_batch(batch_id: str) -> Dict[str, Any]:
+    """
+    Return the batch status. Once the job has finished (completed, failed,
+    expired or cancelled), also return one result per prompt, ordered by
+    prompt index: successes come from the output file, per-request failures
+    from the error file, and prompts that never ran get the batch's error.
+    """
+    client = _require_client()
+    batch = await client.batches.retrieve(batch_id)
+
+    results: Optional[List[Dict[str, Any]]] = None
+    if batch.status in BATCH_TERMINAL_STATUSES:
+        by_index: Dict[int, Dict[str, Any]] = {}
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if file_id:
+                for row in await _read_output_file(client, file_id):
+                    by_index[row["index"]] = row
+
+        # Fill indices that appear in neither file (e.g. the batch failed
+        # validation or expired first) so every prompt gets a result
+        counts = getattr(batch, "request_counts", None)
+        total = max(getattr(counts, "total", 0) or 0, max(by_index, default=-1) + 1)
+        results = []
+        for i in range(total):
+            row = by_index.get(i)
+            if row is None:
+                row = {
+                    "index": i,
+                    "status_code": 500,
+                    "content": None,
+                    "tokens": 0,
+                    "error": _batch_error_message(batch),
+                }
+            results.append(row)
+
+    return {"batch_id": batch.id, "status": batch.status, "results": results}
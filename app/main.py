@@ -1,15 +1,21 @@
 from __future__ import annotations
 
 import logging
+import os
+from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+import orjson
+from fastapi import FastAPI, Request
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import Response
+from fastapi.responses import ORJSONResponse, Response
 
-from app.health import router as health_router
-from app.analyze import router as analyze_router
-from app.scorecard import router as scorecard_router
-from app.version import router as version_router
+from app.routes.health import router as health_router
+from app.routes.analyze import router as analyze_router
+from app.routes.scorecard import router as scorecard_router
+from app.routes.version import router as version_router
+from app.openai_client import close_openai_client
+from app.utils import close_http_client
 
 # ------------------------------------------------------------------------------
 # App metadata
@@ -23,6 +29,20 @@ logger = logging.getLogger("scribbit")
 logging.basicConfig(level=logging.INFO)
 
 
+# ------------------------------------------------------------------------------
+# Lifespan
+# ------------------------------------------------------------------------------
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Release shared outbound connection pools on shutdown.
+    """
+    yield
+    await close_http_client()
+    await close_openai_client()
+
+
 # ------------------------------------------------------------------------------
 # FastAPI app
 # ------------------------------------------------------------------------------
@@ -31,6 +51,8 @@ app = FastAPI(
     title=APP_NAME,
     version=APP_VERSION,
     description=APP_DESCRIPTION,
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 # CORS – keep permissive for now; tighten before going public
@@ -43,28 +65,53 @@ app.add_middleware(
 
 
 # ------------------------------------------------------------------------------
-# Root & favicon
+# Error handlers
 # ------------------------------------------------------------------------------
 
-@app.get("/")
-def root():
+@app.exception_handler(RequestValidationError)
+async def validation_error_handler(request: Request, exc: RequestValidationError):
     """
-    Simple root endpoint that reports basic info and available top-level routes.
+    Compact 422 body: only loc/msg/type per error. The default handler also
+    echoes the offending `input`, which for /analyze can be the whole document.
     """
-    return {
+    detail = [
+        {"loc": e.get("loc", ()), "msg": e.get("msg", ""), "type": e.get("type", "")}
+        for e in exc.errors()
+    ]
+    return ORJSONResponse(status_code=422, content={"detail": detail})
+
+
+# ------------------------------------------------------------------------------
+# Root & favicon
+# ------------------------------------------------------------------------------
+
+# The root payload never changes, so it is encoded once at import.
+_ROOT_BODY = orjson.dumps(
+    {
         "name": APP_NAME,
         "version": APP_VERSION,
         "routes": [
             "/health",
             "/analyze",
+            "/analyze/batch",
             "/scorecard/pdf",
+            "/scorecard/bulk",
             "/version",
         ],
     }
+)
+
+
+@app.get("/")
+async def root():
+    """
+    Simple root endpoint that reports basic info and available top-level routes.
+    """
+    return Response(content=_ROOT_BODY, media_type="application/json")
 
 
 @app.get("/favicon.ico")
-def favicon():
+async def favicon():
     """
     We are not serving a real favicon yet; return 204 so browsers stop nagging.
     """
@@ -79,3 +126,27 @@ app.include_router(health_router)
 app.include_router(analyze_router)
 app.include_router(scorecard_router)
 app.include_router(version_router)
+
+
+# ------------------------------------------------------------------------------
+# Local entrypoint: `python -m app.main`
+# ------------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    import uvicorn
+
+    # SCRIBBIT_RELOAD=1 for local development; reload forces a single worker.
+    reload = os.getenv("SCRIBBIT_RELOAD", "").lower() in ("1", "true", "yes")
+    workers = int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1))
+
+    uvicorn.run(
+        "app.main:app",
+        host=os.getenv("HOST", "0.0.0.0"),
+        port=int(os.getenv("PORT", "8000")),
+        workers=1 if reload else workers,
+        reload=reload,
+        # "auto" resolves to uvloop/httptools when installed (uvicorn[standard])
+        # and falls back cleanly on platforms where uvloop is unavailable.
+        loop="auto",
+        http="auto",
+    )
@@ -1,38 +1,110 @@
+import functools
+import logging
 from typing import Tuple
 from app.config import settings
 
-_openai_cls = None
-_client = None
+log = logging.getLogger("scribbit.openai")
 
-def _load_openai():
-    global _openai_cls, _client
-    if _openai_cls is None:
-        try:
-            from openai import OpenAI
-            _openai_cls = OpenAI
-        except Exception:
-            _openai_cls = False
-    if _client is None and _openai_cls and settings.openai_api_key:
-        _client = _openai_cls(api_key=settings.openai_api_key)
+async def _log_http_version(response) -> None:
+    log.debug("openai %s -> %s", response.request.url.path, response.http_version)
 
-def analyze_text_with_openai(prompt: str) -> Tuple[str, int]:
+def _build_http_client():
+    """
+    Explicit keep-alive pool so sequential and concurrent calls reuse warm
+    connections instead of paying a TCP+TLS handshake each time. HTTP/2 lets
+    concurrent completions multiplex over a single connection.
+    """
+    import httpx
+    from openai import DefaultAsyncHttpxClient
+
+    return DefaultAsyncHttpxClient(
+        http2=True,
+        event_hooks={"response": [_log_http_version]},
+        limits=httpx.Limits(
+            max_keepalive_connections=20,
+            max_connections=100,
+            keepalive_expiry=30.0,
+        ),
+    )
+
+@functools.cache
+def _get_client():
+    """
+    Build the AsyncOpenAI client exactly once per process; None when the SDK
+    or API key is missing (cached too, so we don't retry the import per call).
+    """
+    if not settings.openai_api_key:
+        return None
+    try:
+        from openai import AsyncOpenAI
+    except Exception:
+        return None
+    return AsyncOpenAI(
+        api_key=settings.openai_api_key,
+        http_client=_build_http_client(),
+    )
+
+async def close_openai_client() -> None:
+    """
+    Close the pooled client (called from the app lifespan on shutdown).
+    """
+    if _get_client.cache_info().currsize:
+        client = _get_client()
+        _get_client.cache_clear()
+        if client is not None:
+            await client.close()
+
+def get_openai_client():
+    """
+    Shared AsyncOpenAI client, or None when the SDK or API key is missing.
+    """
+    return _get_client()
+
+# Constant parts of every risk-analysis request, shared rather than rebuilt
+_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": "You are a contract risk analyst. Reply ONLY with compact JSON.",
+}
+# JSON mode: the model can only emit a syntactically valid object.
+_RESPONSE_FORMAT = {"type": "json_object"}
+
+def chat_request_body(prompt: str) -> dict:
+    """
+    Chat-completions parameters used for risk analysis. Shared by the live
+    call below and the Batch API jobs in app.batch_api.
+    """
+    return {
+        "model": settings.openai_model,
+        "messages": [_SYSTEM_MESSAGE, {"role": "user", "content": prompt}],
+        "temperature": 0.1,
+        "max_tokens": 1400,
+        "response_format": _RESPONSE_FORMAT,
+    }
+
+async def analyze_text_with_openai(prompt: str) -> Tuple[str, int]:
     """
     Returns (json_text, tokens_used). If no API key or library, returns a safe empty result.
     The JSON text is expected to include a 'risks' array and 'detected_language'.
+    Async so a slow completion never blocks the event loop.
     """
-    _load_openai()
-    if not (_openai_cls and _client and settings.openai_api_key):
+    client = get_openai_client()
+    if client is None:
         return '{"risks": [], "detected_language": "en"}', 0
 
-    resp = _client.chat.completions.create(
-        model=settings.openai_model,
-        messages=[
-            {"role": "system", "content": "You are a contract risk analyst. Reply ONLY with compact JSON."},
-            {"role": "user", "content": prompt},
-        ],
-        temperature=0.1,
-        max_tokens=1400,
+    # Stream the completion so the connection stays busy with tokens rather
+    # than idling until generation finishes; usage arrives in the last chunk.
+    stream = await client.chat.completions.create(
+        **chat_request_body(prompt),
+        stream=True,
+        stream_options={"include_usage": True},
     )
-    msg = resp.choices[0].message.content or ""
-    tokens = (resp.usage and resp.usage.total_tokens) or 0
-    return msg, tokens
+    parts = []
+    tokens = 0
+    async for chunk in stream:
+        if chunk.choices:
+            delta = chunk.choices[0].delta.content
+            if delta:
+                parts.append(delta)
+        if chunk.usage:
+            tokens = chunk.usage.total_tokens or 0
+    return "".join(parts), tokens
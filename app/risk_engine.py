@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+import hashlib
 import logging
 import re
-from typing import List, Dict, Any, Optional
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
 
 from app.schemas import AnalyzeResponse, RiskItem, RiskSpan
 
@@ -12,98 +16,154 @@ log = logging.getLogger("scribbit.risk_engine")
 # Seed heuristic patterns
 # ------------------------------------------------------------------------------
 
-PATTERNS: Dict[str, Dict[str, Any]] = {
-    "Non-Refundable": {
-        "regex": re.compile(
+@dataclass(frozen=True, slots=True)
+class SeedPattern:
+    """One seed heuristic: a compiled regex plus the RiskItem fields it emits."""
+
+    name: str
+    regex: re.Pattern
+    severity: str
+    score: int
+    rationale: str
+    # Lowercase literals, at least one of which occurs in every match; lets
+    # _run_seed_heuristics skip the regex pass for absent risk types.
+    hints: Tuple[str, ...]
+    # Case-sensitive twin of `regex`, run against pre-lowercased text.
+    regex_lc: re.Pattern = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(
+            self, "regex_lc", re.compile(self.regex.pattern, self.regex.flags & ~re.IGNORECASE)
+        )
+
+
+PATTERNS: Tuple[SeedPattern, ...] = (
+    SeedPattern(
+        name="Non-Refundable",
+        regex=re.compile(
             r"\b(non[-\s]?refundable|all sales are final|no refunds?)\b",
             re.IGNORECASE,
         ),
-        "severity": "High",
-        "score": 9.0,
-        "rationale": "Text indicates payments are non-refundable or all sales are final.",
-    },
-    "Auto-Renewal": {
-        "regex": re.compile(
+        severity="High",
+        score=9,
+        rationale="Text indicates payments are non-refundable or all sales are final.",
+        hints=("refund", "all sales are final"),
+    ),
+    SeedPattern(
+        name="Auto-Renewal",
+        regex=re.compile(
             r"\b(auto[-\s]?renew(al)?|renews? automatically|rollover)\b",
             re.IGNORECASE,
         ),
-        "severity": "Medium",
-        "score": 6.0,
-        "rationale": "Contract renews automatically unless cancelled.",
-    },
-    "Arbitration": {
-        "regex": re.compile(
+        severity="Medium",
+        score=6,
+        rationale="Contract renews automatically unless cancelled.",
+        hints=("renew", "rollover"),
+    ),
+    SeedPattern(
+        name="Arbitration",
+        regex=re.compile(
             r"\barbitration|binding arbitration|waiver of jury trial\b",
             re.IGNORECASE,
         ),
-        "severity": "Medium",
-        "score": 5.0,
-        "rationale": "Disputes may be forced into arbitration; rights may be limited.",
-    },
-    "Unilateral Changes": {
-        "regex": re.compile(
+        severity="Medium",
+        score=5,
+        rationale="Disputes may be forced into arbitration; rights may be limited.",
+        hints=("arbitration", "waiver of jury trial"),
+    ),
+    SeedPattern(
+        name="Unilateral Changes",
+        regex=re.compile(
             r"\bwe may (change|modify|update) (these )?(terms|fees|prices)\b",
             re.IGNORECASE,
         ),
-        "severity": "High",
-        "score": 8.0,
-        "rationale": "One party can change terms/fees unilaterally.",
-    },
-    "Data Sharing": {
-        "regex": re.compile(
+        severity="High",
+        score=8,
+        rationale="One party can change terms/fees unilaterally.",
+        hints=("we may ",),
+    ),
+    SeedPattern(
+        name="Data Sharing",
+        regex=re.compile(
             r"\bshare (your )?(data|information)|third[-\s]?part(y|ies)\b",
             re.IGNORECASE,
         ),
-        "severity": "Medium",
-        "score": 5.0,
-        "rationale": "Mentions data sharing with third parties.",
-    },
-    "Foreign Exchange / Fees": {
-        "regex": re.compile(
+        severity="Medium",
+        score=5,
+        rationale="Mentions data sharing with third parties.",
+        hints=("share ", "third"),
+    ),
+    SeedPattern(
+        name="Foreign Exchange / Fees",
+        regex=re.compile(
             r"\b(foreign exchange|fx|currency conversion|conversion fee|cross[-\s]?border fee)\b",
             re.IGNORECASE,
         ),
-        "severity": "Medium",
-        "score": 5.0,
-        "rationale": "Mentions currency conversion or FX fees.",
-    },
-}
+        severity="Medium",
+        score=5,
+        rationale="Mentions currency conversion or FX fees.",
+        hints=("foreign exchange", "fx", "conversion", "border fee"),
+    ),
+)
 
 
 # ------------------------------------------------------------------------------
 # Internal helpers
 # ------------------------------------------------------------------------------
 
+# Characters for which re.IGNORECASE and str.lower() disagree (dotted and
+# dotless I, long s). Text containing them is scanned with the re.I patterns
+# and without the hint prefilter; everything else is lowercased once.
+_CASE_FOLD_ODDITIES = ("\u0130", "\u0131", "\u017f")
+
+
+def _lowered_for_scan(text: str) -> Optional[str]:
+    if not text.isascii() and any(c in text for c in _CASE_FOLD_ODDITIES):
+        return None
+    return text.lower()
+
+
 def _run_seed_heuristics(text: str) -> List[RiskItem]:
     """
     Run simple keyword/regex-based heuristics and return a list of RiskItem objects.
     Each RiskItem now also carries an `evidence` list for UI expansion.
     """
     risks: List[RiskItem] = []
+    lowered = _lowered_for_scan(text)
 
-    for risk_type, cfg in PATTERNS.items():
-        regex = cfg["regex"]
-        severity = cfg["severity"]
-        score = float(cfg["score"])
-        rationale = cfg["rationale"]
+    for pat in PATTERNS:
+        if lowered is not None:
+            # Substring checks are far cheaper than a regex pass over the text
+            if not any(h in lowered for h in pat.hints):
+                continue
+            # Same offsets as `text` (lower() preserves length here), minus
+            # the per-character case folding of re.IGNORECASE.
+            matches = pat.regex_lc.finditer(lowered)
+        else:
+            matches = pat.regex.finditer(text)
 
-        for m in regex.finditer(text):
+        risk_type = pat.name
+        severity = pat.severity
+        score = pat.score
+        rationale = pat.rationale
+
+        for m in matches:
             start = m.start()
             end = m.end()
 
-            # Grab a local snippet around the match
-            window_start = max(start - 80, 0)
-            window_end = min(end + 80, len(text))
-            snippet = text[window_start:window_end].strip()
+            # Grab a local snippet around the match (slicing clamps the end).
+            # Offsets stay in characters: span.start/end are part of the API.
+            snippet = text[max(start - 80, 0):end + 80].strip()
 
-            span = RiskSpan(start=start, end=end)
+            # Engine-built data is already well-typed; skip pydantic validation
+            span = RiskSpan.model_construct(start=start, end=end)
 
             # For now, evidence is a single-item list containing the snippet.
             # Later you can expand this to line-based evidence or multiple hits.
             evidence = [snippet] if snippet else []
 
             risks.append(
-                RiskItem(
+                RiskItem.model_construct(
                     type=risk_type,
                     severity=severity,
                     score=score,
@@ -131,6 +191,35 @@ def _grade_from_score(total_risk_score: float) -> str:
     return "D"
 
 
+# ------------------------------------------------------------------------------
+# Analysis cache
+# ------------------------------------------------------------------------------
+
+# Identical T&Cs are re-submitted often (Analyze then Download PDF, popular
+# sites). Results are keyed by a digest of the text rather than the text
+# itself so the cache never pins large documents in memory, plus the engine;
+# doc_name and include_explanation don't affect the scan, so re-analyzing
+# under a different name or with explanations toggled is still a hit.
+ANALYSIS_CACHE_SIZE = 512
+
+_analysis_cache: "OrderedDict[Tuple[str, str], AnalyzeResponse]" = OrderedDict()
+_analysis_cache_lock = threading.Lock()
+
+
+def _text_digest(text: str) -> str:
+    return hashlib.blake2b(
+        text.encode("utf-8", "surrogatepass"), digest_size=16
+    ).hexdigest()
+
+
+def clear_analysis_cache() -> None:
+    """
+    Drop all cached analyses, e.g. after PATTERNS or the engine changes.
+    """
+    with _analysis_cache_lock:
+        _analysis_cache.clear()
+
+
 # ------------------------------------------------------------------------------
 # Public API
 # ------------------------------------------------------------------------------
@@ -146,9 +235,44 @@ def analyze_terms(
 
     - Currently uses seed heuristics (regex patterns).
     - In the future, model_hint can route to OpenAI or other engines.
+    - Results are memoized per (text digest, engine). Results are frozen
+      models, so the cached instance is returned as-is (or a shallow copy
+      carrying this call's doc_name).
     """
     engine = (model_hint or "seed-heuristics").strip().lower()
+    key = (_text_digest(text), engine)
+
+    with _analysis_cache_lock:
+        cached = _analysis_cache.get(key)
+        if cached is not None:
+            _analysis_cache.move_to_end(key)
+    if cached is not None:
+        log.debug("analyze_terms: cache hit for doc=%s", doc_name or "N/A")
+        return _with_doc_name(cached, doc_name)
+
+    result = _analyze_uncached(text, doc_name, engine)
 
+    with _analysis_cache_lock:
+        _analysis_cache[key] = result
+        _analysis_cache.move_to_end(key)
+        while len(_analysis_cache) > ANALYSIS_CACHE_SIZE:
+            _analysis_cache.popitem(last=False)
+
+    return result
+
+
+def _with_doc_name(result: AnalyzeResponse, doc_name: Optional[str]) -> AnalyzeResponse:
+    doc_name = doc_name or ""
+    if result.doc_name == doc_name:
+        return result
+    return result.model_copy(update={"doc_name": doc_name})
+
+
+def _analyze_uncached(
+    text: str,
+    doc_name: Optional[str],
+    engine: str,
+) -> AnalyzeResponse:
     if engine in ("seed-heuristics", "heuristics", "local", ""):
         risks = _run_seed_heuristics(text)
         model_used = "seed-heuristics"
@@ -177,11 +301,11 @@ def analyze_terms(
         model_used,
     )
 
-    return AnalyzeResponse(
+    return AnalyzeResponse.model_construct(
         doc_name=doc_name or "",
         total_risk_score=total_risk_score,
         grade=grade,
-        risks=risks,
+        risks=tuple(risks),
         model=model_used,
         tokens=tokens,
     )
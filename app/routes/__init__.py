@@ -0,0 +1 @@
+# Makes `app.routes` a package; each module exposes a `router`.
@@ -1,13 +1,21 @@
 from __future__ import annotations
 
 import logging
-from typing import Dict
+from typing import Dict, List, Optional
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import Response
+from pydantic import TypeAdapter, ValidationError
+from starlette.concurrency import run_in_threadpool
 
+from app.batch import run_batch
+from app.config import settings
 from app.schemas import (
     AnalyzeRequest,
     AnalyzeResponse,
+    BatchAnalyzeItem,
+    BatchAnalyzeResponse,
     PanelRiskItem,
     PanelRiskResult,
 )
@@ -17,6 +25,22 @@ router = APIRouter(tags=["analyze"])
 
 log = logging.getLogger("scribbit.api.analyze")
 
+# Built once at import: /analyze decodes the raw body and encodes the result
+# through pydantic-core directly instead of FastAPI's param/body pipeline.
+_REQUEST_ADAPTER = TypeAdapter(AnalyzeRequest)
+_RESPONSE_ADAPTER = TypeAdapter(AnalyzeResponse)
+
+# Settings are fixed for the life of the process; resolve once at import.
+_MAX_INPUT_CHARS = settings.max_input_chars
+
+# Upper bound on documents per /analyze/batch call
+MAX_BATCH_SIZE = 50
+
+# Engine scans per /analyze/batch call that may hold a threadpool worker at
+# once; the scans are CPU-bound, so more would only crowd out other requests
+# sharing Starlette's threadpool.
+MAX_BATCH_CONCURRENCY = 2
+
 
 # ------------------------------------------------------------------------------
 # Mapping from engine risk types → panel categories/cards (Option A)
@@ -91,17 +115,17 @@ def _build_panel_risk_result(engine_result: AnalyzeResponse) -> PanelRiskResult:
     }
 
     for r in engine_result.risks:
-        # Look up mapping, fallback to a generic financial card
-        mapping = RISK_TYPE_MAPPING.get(
-            r.type,
-            {
+        # Look up mapping, fallback to a generic financial card. The fallback
+        # is only built on a miss; known types are a single dict lookup.
+        mapping = RISK_TYPE_MAPPING.get(r.type)
+        if mapping is None:
+            mapping = {
                 "id": r.type.lower().replace(" ", "_"),
                 "category": "financial",
                 "title": r.type,
                 "description": r.rationale
                 or "This term may create financial or contract risk.",
-            },
-        )
+            }
 
         category = mapping.get("category", "financial")
         # Accumulate category score
@@ -111,7 +135,7 @@ def _build_panel_risk_result(engine_result: AnalyzeResponse) -> PanelRiskResult:
             category_scores[category] = float(r.score)
 
         description = mapping.get("description") or r.rationale or ""
-        panel_risk = PanelRiskItem(
+        panel_risk = PanelRiskItem.model_construct(
             id=mapping.get("id", "risk"),
             category=category,
             title=mapping.get("title", r.type),
@@ -136,7 +160,7 @@ def _build_panel_risk_result(engine_result: AnalyzeResponse) -> PanelRiskResult:
 
     overall_level = _map_overall_level(risk_score)
 
-    return PanelRiskResult(
+    return PanelRiskResult.model_construct(
         risks=panel_risks,
         categoryScores=scaled_category_scores,
         riskScore=risk_score,
@@ -146,20 +170,33 @@ def _build_panel_risk_result(engine_result: AnalyzeResponse) -> PanelRiskResult:
     )
 
 
-@router.post("/analyze", response_model=AnalyzeResponse)
-def analyze(payload: AnalyzeRequest) -> AnalyzeResponse:
+async def run_analysis(
+    text: str,
+    doc_name: str,
+    include_explanation: bool,
+    model_hint: Optional[str] = None,
+) -> AnalyzeResponse:
     """
-    Analyze raw T&Cs text and return a structured risk summary.
+    Run the risk engine exactly once for a request and map engine failures
+    to HTTP errors. Shared by /analyze and /scorecard/pdf.
 
-    - Engine-level metrics come from analyze_terms (total_risk_score, grade, risks, etc.)
-    - riskResult is attached for panel.js / UI consumption.
+    The regex engine is CPU-bound, so it runs in the threadpool to keep the
+    event loop free for other requests. Oversized input is rejected up front
+    so the worst-case work per request stays bounded.
     """
+    if len(text) > _MAX_INPUT_CHARS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Text too large (max {_MAX_INPUT_CHARS} characters).",
+        )
+
     try:
-        engine_result = analyze_terms(
-            text=payload.text,
-            doc_name=payload.doc_name,
-            include_explanation=payload.include_explanation,
-            model_hint=payload.model_hint,
+        return await run_in_threadpool(
+            analyze_terms,
+            text=text,
+            doc_name=doc_name,
+            include_explanation=include_explanation,
+            model_hint=model_hint,
         )
     except NotImplementedError as nie:
         # AI deep-dive path not yet implemented
@@ -173,12 +210,126 @@ def analyze(payload: AnalyzeRequest) -> AnalyzeResponse:
             detail="Analysis failed due to an internal error.",
         )
 
-    # Attach panel-friendly riskResult for the UI
+
+def _attach_panel_result(engine_result: AnalyzeResponse) -> AnalyzeResponse:
+    """
+    Return a copy of the result with the panel-friendly riskResult for the
+    UI attached. Panel formatting problems are logged but never break the
+    core response (the engine result is returned unchanged).
+    """
     try:
-        panel_result = _build_panel_risk_result(engine_result)
-        engine_result.riskResult = panel_result
+        panel = _build_panel_risk_result(engine_result)
     except Exception as exc:
-        # Log but do not break the core response if panel formatting fails
         log.exception("Failed to build panel riskResult: %s", exc)
+        return engine_result
+    return engine_result.model_copy(update={"riskResult": panel})
+
+
+@router.post(
+    "/analyze",
+    responses={200: {"model": AnalyzeResponse}},
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {"schema": AnalyzeRequest.model_json_schema()}
+            },
+        }
+    },
+)
+async def analyze(request: Request) -> Response:
+    """
+    Analyze raw T&Cs text and return a structured risk summary.
+
+    - Engine-level metrics come from analyze_terms (total_risk_score, grade, risks, etc.)
+    - riskResult is attached for panel.js / UI consumption.
+    """
+    # The raw body is parsed and validated in one pydantic-core pass; errors
+    # are re-raised as RequestValidationError so clients still get a 422.
+    body = await request.body()
+    try:
+        payload = _REQUEST_ADAPTER.validate_json(body)
+    except ValidationError as exc:
+        raise RequestValidationError(
+            [
+                {**err, "loc": ("body", *err["loc"])}
+                for err in exc.errors(include_url=False)
+            ],
+            body=body,
+        )
+
+    engine_result = await run_analysis(
+        text=payload.text,
+        doc_name=payload.doc_name,
+        include_explanation=payload.include_explanation,
+        model_hint=payload.model_hint,
+    )
 
-    return engine_result
+    engine_result = _attach_panel_result(engine_result)
+
+    # The engine already builds a valid AnalyzeResponse, so serialize it
+    # straight to JSON bytes (no intermediate dict, no response_model
+    # re-validation).
+    return Response(
+        content=_RESPONSE_ADAPTER.dump_json(engine_result),
+        media_type="application/json",
+    )
+
+
+@router.post("/analyze/batch", responses={200: {"model": BatchAnalyzeResponse}})
+async def analyze_batch(payloads: List[AnalyzeRequest]) -> Response:
+    """
+    Analyze several documents in one call.
+
+    Each entry carries either its AnalyzeResponse or the error that document
+    hit, so one bad document does not fail the batch.
+    """
+    if len(payloads) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Too many documents (max {MAX_BATCH_SIZE} per batch).",
+        )
+
+    async def one(payload: AnalyzeRequest) -> AnalyzeResponse:
+        engine_result = await run_analysis(
+            text=payload.text,
+            doc_name=payload.doc_name,
+            include_explanation=payload.include_explanation,
+            model_hint=payload.model_hint,
+        )
+        return _attach_panel_result(engine_result)
+
+    outcomes = await run_batch(payloads, one, max_concurrency=MAX_BATCH_CONCURRENCY)
+
+    items: List[BatchAnalyzeItem] = []
+    for index, outcome in enumerate(outcomes):
+        if isinstance(outcome, HTTPException):
+            items.append(
+                BatchAnalyzeItem.model_construct(
+                    index=index,
+                    status_code=outcome.status_code,
+                    result=None,
+                    error=str(outcome.detail),
+                )
+            )
+        elif isinstance(outcome, BaseException):
+            log.error("Batch item %d failed: %r", index, outcome)
+            items.append(
+                BatchAnalyzeItem.model_construct(
+                    index=index,
+                    status_code=500,
+                    result=None,
+                    error="Analysis failed due to an internal error.",
+                )
+            )
+        else:
+            items.append(
+                BatchAnalyzeItem.model_construct(
+                    index=index, status_code=200, result=outcome, error=None
+                )
+            )
+
+    return Response(
+        content=BatchAnalyzeResponse.model_construct(results=items).model_dump_json(),
+        media_type="application/json",
+    )
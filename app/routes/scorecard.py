@@ -1,16 +1,47 @@
 from __future__ import annotations
 
-from io import BytesIO
+import logging
+import re
+import tempfile
+from functools import lru_cache
+from typing import AsyncIterator, BinaryIO, List
 
 from fastapi import APIRouter, HTTPException
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
+from starlette.concurrency import run_in_threadpool
 
-from app.risk_engine import analyze_terms
-from app.schemas import AnalyzeResponse
+from app.batch_api import (
+    BatchAPIUnavailable,
+    build_risk_prompt,
+    poll_batch,
+    submit_batch,
+)
+from app.config import settings
+from app.routes.analyze import run_analysis
+from app.schemas import AnalyzeResponse, BulkScorecardStatus, BulkScorecardSubmitted
+from app.utils import CTRL_TO_SPACE
 
 router = APIRouter(tags=["scorecard"])
 
+log = logging.getLogger("scribbit.api.scorecard")
+
+# PDFs are spooled in memory up to this size, then roll over to a temp file.
+PDF_SPOOL_MAX_BYTES = 1 << 20
+PDF_CHUNK_SIZE = 64 * 1024
+
+# One pass collapses every run of unsafe characters (spaces, quotes, slashes)
+_FILENAME_RX = re.compile(r"[^A-Za-z0-9._-]+")
+
+# Settings are fixed for the life of the process; resolve once at import.
+_MAX_INPUT_CHARS = settings.max_input_chars
+
+# Upper bounds per /scorecard/bulk submission. The total keeps the JSONL
+# upload (up to 4 UTF-8 bytes per char, plus JSON escaping) well under
+# OpenAI's 200 MB batch input file limit.
+MAX_BULK_DOCUMENTS = 1000
+MAX_BULK_TOTAL_CHARS = 25_000_000
+
 
 class ScorecardRequest(BaseModel):
     doc_name: str = Field(..., description="Filename/title to embed")
@@ -21,9 +52,13 @@ class ScorecardRequest(BaseModel):
     )
 
 
+@lru_cache(maxsize=1)
 def _try_import_reportlab():
     """
     Lazy import so your server still boots if reportlab isn't installed.
+
+    Cached so the imports, the sample stylesheet and the (immutable) risk
+    table style are built once per process instead of on every request.
     """
     try:
         from reportlab.lib.pagesizes import LETTER
@@ -36,16 +71,28 @@ def _try_import_reportlab():
             TableStyle,
         )
         from reportlab.lib import colors
+        from reportlab import rl_config
+
+        # Skip ReportLab's per-shape argument validation; our inputs are fixed
+        rl_config.shapeChecking = 0
 
         return {
             "LETTER": LETTER,
-            "getSampleStyleSheet": getSampleStyleSheet,
+            "styles": getSampleStyleSheet(),
+            "risk_table_style": TableStyle(
+                [
+                    ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
+                    ("TEXTCOLOR", (0, 0), (-1, 0), colors.black),
+                    ("GRID", (0, 0), (-1, -1), 0.25, colors.grey),
+                    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+                    ("FONTSIZE", (0, 0), (-1, -1), 9),
+                    ("ALIGN", (2, 1), (2, -1), "RIGHT"),
+                ]
+            ),
             "SimpleDocTemplate": SimpleDocTemplate,
             "Paragraph": Paragraph,
             "Spacer": Spacer,
             "Table": Table,
-            "TableStyle": TableStyle,
-            "colors": colors,
         }
     except Exception:
         return None
@@ -55,7 +102,11 @@ def _build_pdf(
     doc_name: str,
     analysis: AnalyzeResponse,
     include_explanation: bool,
-) -> bytes:
+) -> BinaryIO:
+    """
+    Render the scorecard into a spooled temp file and return it rewound to
+    the start. The caller owns the file and must close it.
+    """
     rl = _try_import_reportlab()
     if rl is None:
         # Tell the client how to fix it rather than a generic 500
@@ -67,9 +118,7 @@ def _build_pdf(
             ),
         )
 
-    buf = BytesIO()
-    doc = rl["SimpleDocTemplate"](buf, pagesize=rl["LETTER"])
-    styles = rl["getSampleStyleSheet"]()
+    styles = rl["styles"]
     story = []
 
     title = f"Scribbit Risk Scorecard — {doc_name}"
@@ -85,71 +134,142 @@ def _build_pdf(
     story.append(rl["Spacer"](1, 6))
 
     # Risks table
-    data = [["Type", "Severity", "Score", "Snippet"]]
-    for r in analysis.risks:
-        snippet = (r.snippet or "")[:140].replace("\n", " ")
-        data.append(
-            [
-                r.type,
-                r.severity,
-                f"{r.score:.2f}",
-                snippet,
-            ]
-        )
+    data = [["Type", "Severity", "Score", "Snippet"]] + [
+        [r.type, r.severity, str(r.score), (r.snippet or "")[:140].translate(CTRL_TO_SPACE)]
+        for r in analysis.risks
+    ]
 
     table = rl["Table"](data, hAlign="LEFT")
-    table.setStyle(
-        rl["TableStyle"](
-            [
-                ("BACKGROUND", (0, 0), (-1, 0), rl["colors"].lightgrey),
-                ("TEXTCOLOR", (0, 0), (-1, 0), rl["colors"].black),
-                ("GRID", (0, 0), (-1, -1), 0.25, rl["colors"].grey),
-                ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                ("FONTSIZE", (0, 0), (-1, -1), 9),
-                ("ALIGN", (2, 1), (2, -1), "RIGHT"),
-            ]
-        )
-    )
+    table.setStyle(rl["risk_table_style"])
     story.append(table)
     story.append(rl["Spacer"](1, 10))
 
     if include_explanation:
         story.append(rl["Paragraph"]("Notes", styles["Heading3"]))
-        for r in analysis.risks:
-            if r.rationale:
-                story.append(
-                    rl["Paragraph"](
-                        f"<b>{r.type}:</b> {r.rationale}",
-                        styles["BodyText"],
-                    )
-                )
-                story.append(rl["Spacer"](1, 6))
+        # One Paragraph for all notes instead of a Paragraph + Spacer per risk
+        notes = "<br/><br/>".join(
+            f"<b>{r.type}:</b> {r.rationale}" for r in analysis.risks if r.rationale
+        )
+        if notes:
+            story.append(rl["Paragraph"](notes, styles["BodyText"]))
+
+    out = tempfile.SpooledTemporaryFile(max_size=PDF_SPOOL_MAX_BYTES)
+    try:
+        doc = rl["SimpleDocTemplate"](out, pagesize=rl["LETTER"])
+        doc.build(story)
+    except BaseException:
+        out.close()
+        raise
+    out.seek(0)
+    return out
+
+
+def _safe_filename(doc_name: str) -> str:
+    """
+    Turn a doc name into something safe inside a quoted Content-Disposition.
+    """
+    return _FILENAME_RX.sub("_", doc_name.strip()).strip("_") or "document"
+
+
+async def _iter_chunks(f: BinaryIO, chunk_size: int = PDF_CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """
+    Yield fixed-size chunks from f and close it once the response is done
+    (or the client goes away).
 
-    doc.build(story)
-    return buf.getvalue()
+    Async so StreamingResponse doesn't hop to the threadpool for every chunk
+    (it does for sync iterators). The spool is in memory up to
+    PDF_SPOOL_MAX_BYTES and page-cached beyond, so reads don't block.
+    """
+    try:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        f.close()
 
 
 @router.post("/scorecard/pdf", response_class=StreamingResponse)
-def scorecard_pdf(payload: ScorecardRequest):
+async def scorecard_pdf(payload: ScorecardRequest):
     """
     Generate a PDF scorecard based on the same analysis used by /analyze.
     """
-    analysis: AnalyzeResponse = analyze_terms(
+    # The analysis runs once through the shared run_analysis helper and the
+    # resulting AnalyzeResponse is handed straight to the PDF builder. Both
+    # steps are CPU-bound, so they run in the threadpool.
+    analysis: AnalyzeResponse = await run_analysis(
         text=payload.text,
         doc_name=payload.doc_name,
         include_explanation=payload.include_explanation,
         model_hint=None,
     )
 
-    pdf_bytes = _build_pdf(
+    pdf_file = await run_in_threadpool(
+        _build_pdf,
         doc_name=payload.doc_name,
         analysis=analysis,
         include_explanation=payload.include_explanation,
     )
 
-    filename = f"{payload.doc_name.replace(' ', '_')}_scribbit_scorecard.pdf"
+    filename = f"{_safe_filename(payload.doc_name)}_scribbit_scorecard.pdf"
     return StreamingResponse(
-        BytesIO(pdf_bytes),
+        _iter_chunks(pdf_file),
         media_type="application/pdf",
         headers={"Content-Disposition": f'attachment; filename=\"{filename}\"'},
     )
+
+
+@router.post("/scorecard/bulk", response_model=BulkScorecardSubmitted)
+async def scorecard_bulk_submit(payloads: List[ScorecardRequest]):
+    """
+    Queue many documents for non-interactive analysis via the OpenAI Batch
+    API (about half the cost, results within 24h). Poll
+    GET /scorecard/bulk/{batch_id} for the outcome.
+    """
+    if not payloads:
+        raise HTTPException(status_code=400, detail="No documents submitted.")
+    if len(payloads) > MAX_BULK_DOCUMENTS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Too many documents (max {MAX_BULK_DOCUMENTS} per batch).",
+        )
+    if any(len(p.text) > _MAX_INPUT_CHARS for p in payloads):
+        raise HTTPException(
+            status_code=413,
+            detail=f"Text too large (max {_MAX_INPUT_CHARS} characters).",
+        )
+    if sum(len(p.doc_name) + len(p.text) for p in payloads) > MAX_BULK_TOTAL_CHARS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large (max {MAX_BULK_TOTAL_CHARS} characters in total).",
+        )
+
+    prompts = [build_risk_prompt(p.doc_name, p.text) for p in payloads]
+    try:
+        batch_id = await submit_batch(prompts)
+    except BatchAPIUnavailable as exc:
+        raise HTTPException(status_code=503, detail=str(exc))
+    except Exception as exc:
+        log.exception("Batch submission failed: %s", exc)
+        raise HTTPException(status_code=502, detail="Failed to submit batch to OpenAI.")
+
+    return BulkScorecardSubmitted(batch_id=batch_id, count=len(prompts))
+
+
+@router.get("/scorecard/bulk/{batch_id}", response_model=BulkScorecardStatus)
+async def scorecard_bulk_status(batch_id: str):
+    """
+    Report the status of a bulk scorecard batch, with per-document results
+    once it has finished.
+    """
+    try:
+        return await poll_batch(batch_id)
+    except BatchAPIUnavailable as exc:
+        raise HTTPException(status_code=503, detail=str(exc))
+    except Exception as exc:
+        if getattr(exc, "status_code", None) == 404:
+            raise HTTPException(status_code=404, detail="Unknown batch id.")
+        log.exception("Batch poll failed for %s: %s", batch_id, exc)
+        raise HTTPException(status_code=502, detail="Failed to fetch batch from OpenAI.")
+
@@ -1,16 +1,24 @@
 from fastapi import APIRouter
-from datetime import datetime
+from fastapi.responses import Response
+from datetime import datetime, timezone
+
+import orjson
 
 router = APIRouter(tags=["version"])
 
+# Build info is fixed for the life of the process
+_VERSION_INFO = {
+    "name": "scribbit-backend",
+    "version": "0.1.0",
+    "environment": "codespaces",
+}
+
 @router.get("/version")
-def get_version():
+async def get_version():
     """
     Returns basic build/version info.
     """
-    return {
-        "name": "scribbit-backend",
-        "version": "0.1.0",
-        "environment": "codespaces",
-        "timestamp": datetime.utcnow().isoformat() + "Z"
-    }
+    # Async: nothing here blocks, so skip the threadpool hop a sync route gets.
+    # orjson formats the UTC timestamp itself (OPT_UTC_Z keeps the "Z" suffix).
+    body = {**_VERSION_INFO, "timestamp": datetime.now(timezone.utc)}
+    return Response(orjson.dumps(body, option=orjson.OPT_UTC_Z), media_type="application/json")
@@ -1,8 +1,8 @@
 from __future__ import annotations
 
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Tuple
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 # ------------------------------------------------------------------------------
@@ -37,7 +37,14 @@ class AnalyzeRequest(BaseModel):
 # Risk item models (engine-level)
 # ------------------------------------------------------------------------------
 
+# Engine output is immutable once built, so cached results can be handed out
+# without copying. Use model_copy(update=...) to derive a modified result.
+_RESULT_CONFIG = ConfigDict(frozen=True, extra="ignore")
+
+
 class RiskSpan(BaseModel):
+    model_config = _RESULT_CONFIG
+
     start: int
     end: int
 
@@ -46,9 +53,11 @@ class RiskItem(BaseModel):
     """
     Raw risk item produced by the engine.
     """
+    model_config = _RESULT_CONFIG
+
     type: str
     severity: str
-    score: float
+    score: int
     span: Optional[RiskSpan] = None
     snippet: Optional[str] = None
     rationale: Optional[str] = None
@@ -66,6 +75,8 @@ class PanelRiskItem(BaseModel):
     """
     Risk item formatted for the panel UI.
     """
+    model_config = _RESULT_CONFIG
+
     id: str
     category: str  # financial | data_privacy | content_ip | legal_rights
     title: str
@@ -79,6 +90,8 @@ class PanelRiskResult(BaseModel):
     """
     Structure expected by panel.js (or compatible with its normalizeRiskResult).
     """
+    model_config = _RESULT_CONFIG
+
     risks: List[PanelRiskItem]
     categoryScores: Dict[str, float]
     riskScore: float
@@ -97,13 +110,66 @@ class AnalyzeResponse(BaseModel):
     - Core engine metrics (doc_name, total_risk_score, grade, risks, model, tokens)
     - Optional riskResult for UI consumption (panel.js).
     """
+    model_config = _RESULT_CONFIG
+
     doc_name: str
     total_risk_score: float
     grade: str
-    risks: List[RiskItem]
+    # Tuple: results are shared from the analysis cache and must stay read-only
+    risks: Tuple[RiskItem, ...]
     model: str
     tokens: int
     riskResult: Optional[PanelRiskResult] = Field(
         default=None,
         description="Optional panel-friendly riskResult structure."
     )
+
+
+# ------------------------------------------------------------------------------
+# Batch models
+# ------------------------------------------------------------------------------
+
+class BatchAnalyzeItem(BaseModel):
+    """
+    One entry of a /analyze/batch response: either a result or an error.
+    """
+    index: int
+    status_code: int = 200
+    result: Optional[AnalyzeResponse] = None
+    error: Optional[str] = None
+
+
+class BatchAnalyzeResponse(BaseModel):
+    """
+    Response for /analyze/batch; `results` follows the request order.
+    """
+    results: List[BatchAnalyzeItem]
+
+
+# ------------------------------------------------------------------------------
+# Bulk scorecard models (OpenAI Batch API)
+# ------------------------------------------------------------------------------
+
+class BulkScorecardSubmitted(BaseModel):
+    batch_id: str
+    count: int
+
+
+class BulkScorecardResult(BaseModel):
+    """
+    Model output for one submitted document; `index` is its request position.
+    """
+    index: int
+    status_code: int
+    content: Optional[str] = None
+    tokens: int = 0
+    error: Optional[str] = None
+
+
+class BulkScorecardStatus(BaseModel):
+    batch_id: str
+    status: str
+    results: Optional[List[BulkScorecardResult]] = Field(
+        default=None,
+        description="Present once the batch has finished (completed, failed, expired or cancelled).",
+    )
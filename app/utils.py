@@ -2,12 +2,26 @@ import re
 import httpx
 from app.config import settings
 
+# For str.translate: flattens line breaks/tabs (e.g. in PDF table cells)
+CTRL_TO_SPACE = str.maketrans({c: " " for c in "\n\r\t"})
+
 def detect_language_simple(text: str) -> str:
     # ultra-light heuristic (you can swap with a real detector later)
-    ascii_ratio = sum(1 for c in text if ord(c) < 128) / max(1, len(text))
+    if text and text.isascii():
+        return "en"
+    # encode() drops every non-ASCII char in one C pass, leaving the ASCII count
+    ascii_ratio = len(text.encode("ascii", "ignore")) / max(1, len(text))
     return "en" if ascii_ratio > 0.9 else "unknown"
 
-def find_matches(lines: list[str], patterns: list[re.Pattern], max_hits: int = 5) -> list[str]:
+def find_matches(text: str | list[str], patterns: list[re.Pattern], max_hits: int = 5) -> list[str]:
+    """
+    Up to max_hits context strings (the hit line plus its neighbours, at most
+    one per line) for lines matching any of patterns. Each pattern is searched
+    against the stripped line on its own, so anchors and lookarounds behave
+    per line.
+    """
+    # older callers pass pre-split lines
+    lines = text.split("\n") if isinstance(text, str) else text
     hits = []
     for i, line in enumerate(lines):
         line_slim = line.strip()
@@ -25,12 +39,43 @@ def find_matches(lines: list[str], patterns: list[re.Pattern], max_hits: int = 5
             break
     return hits
 
+# Shared outbound client: keep-alive connections (and HTTP/2 multiplexing)
+# are reused across requests instead of paying a TCP+TLS handshake per fetch.
+# Created lazily; app.main closes it on shutdown.
+_http_client: httpx.AsyncClient | None = None
+
+def get_http_client() -> httpx.AsyncClient:
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            http2=True,
+            timeout=httpx.Timeout(15.0, connect=5.0),
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+            follow_redirects=True,
+        )
+    return _http_client
+
+async def close_http_client() -> None:
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
 async def fetch_url_text(url: str) -> str:
-    timeout = httpx.Timeout(15.0, connect=5.0)
-    async with httpx.AsyncClient(timeout=timeout, follow_redirects=True) as client:
-        r = await client.get(url)
+    # Stream the body and stop once enough bytes for max_input_chars have
+    # arrived (UTF-8 is at most 4 bytes/char), so a multi-MB page never sits
+    # in memory in full. Non-text responses are dropped before any body read.
+    async with get_http_client().stream("GET", url) as r:
         r.raise_for_status()
         ctype = r.headers.get("content-type", "")
-        if "text" in ctype or "json" in ctype or "xml" in ctype:
-            return r.text[: settings.max_input_chars]
-        return ""
+        if not ("text" in ctype or "json" in ctype or "xml" in ctype):
+            return ""
+        limit = settings.max_input_chars * 4
+        buf = bytearray()
+        async for chunk in r.aiter_bytes(chunk_size=64 * 1024):
+            buf += chunk
+            if len(buf) >= limit:
+                break
+        return buf[:limit].decode(r.encoding or "utf-8", errors="replace")[
+            : settings.max_input_chars
+        ]
@@ -0,0 +1,77 @@
+import re
+import sys
+
+from app.risk_engine import (
+    PATTERNS,
+    _CASE_FOLD_ODDITIES,
+    _lowered_for_scan,
+    _run_seed_heuristics,
+)
+
+CORPUS = [
+    "",
+    "No refunds. ALL SALES ARE FINAL. This fee is Non-Refundable.",
+    "Your plan Renews Automatically; AUTO-RENEWAL applies unless you opt out. Rollover too.",
+    "Any dispute goes to Binding Arbitration. WAIVER OF JURY TRIAL.",
+    "We May Change These Terms at any time. WE MAY UPDATE PRICES.",
+    "We SHARE YOUR DATA with Third-Parties and third party partners.",
+    "FX and Currency Conversion fees apply, plus a CROSS-BORDER FEE. Foreign Exchange.",
+    # Non-ASCII text that lowercases cleanly (Kelvin sign folds to "k")
+    "Überweisungen: No Refunds für \u212aunden. Währung: FX-Gebühr, café third-party.",
+    # re.IGNORECASE and str.lower() disagree on these
+    "İstanbul: NO REFUNDS. We may change fees.",
+    "Tıcket: non-refundable, auto-renewal, share data.",
+    "Reſale: no refundſ, third parties, arbitration.",
+    "ſhare your data? No: share your data. Refunds? No refunds.",
+]
+
+
+def _reference(text):
+    found = []
+    for p in PATTERNS:
+        for m in p.regex.finditer(text):
+            snippet = text[max(m.start() - 80, 0):m.end() + 80].strip()
+            found.append((p.name, m.start(), m.end(), snippet))
+    return found
+
+
+def test_seed_heuristics_match_plain_ignorecase_scan():
+    for text in CORPUS:
+        got = [(r.type, r.span.start, r.span.end, r.snippet) for r in _run_seed_heuristics(text)]
+        assert got == _reference(text), text
+
+
+def test_every_match_contains_a_hint():
+    # The hint prefilter only runs on text that takes the lowercase path
+    for text in filter(_lowered_for_scan, CORPUS):
+        for p in PATTERNS:
+            for m in p.regex.finditer(text):
+                matched = m.group().lower()
+                assert any(h in matched for h in p.hints), (p.name, m.group())
+
+
+def test_pattern_literals_and_hints_are_lowercase():
+    for p in PATTERNS:
+        assert p.regex.flags & re.IGNORECASE, p.name
+        assert p.regex.pattern == p.regex.pattern.lower(), p.name
+        assert all(h == h.lower() for h in p.hints), p.name
+
+
+def test_case_fold_oddities_cover_ignorecase_lower_disagreements():
+    # The lowercase fast path is exact only where lower() keeps the length
+    # and matches an ASCII letter exactly when re.IGNORECASE does.
+    any_letter = re.compile("[a-z]", re.IGNORECASE)
+    disagreeing = []
+    for cp in range(0x80, sys.maxunicode + 1):
+        if 0xD800 <= cp <= 0xDFFF:
+            continue
+        c = chr(cp)
+        lc = c.lower()
+        if len(lc) != 1:
+            disagreeing.append(c)
+            continue
+        folds = any_letter.fullmatch(c) is not None
+        if folds != (lc.isascii() and lc.isalpha()) or (folds and not re.fullmatch(lc, c, re.IGNORECASE)):
+            disagreeing.append(c)
+    assert disagreeing
+    assert set(disagreeing) <= set(_CASE_FOLD_ODDITIES)
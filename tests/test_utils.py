@@ -0,0 +1,42 @@
+import re
+
+from app.utils import find_matches
+
+
+def test_find_matches_line_context():
+    lines = ["intro", "no refunds at all", "outro", "", "fees apply"]
+    pats = [re.compile(r"refund"), re.compile(r"\bfees?\b", re.I)]
+    assert find_matches(lines, pats) == ["intro no refunds at all outro", " fees apply"]
+
+
+def test_find_matches_text_and_lines_agree():
+    lines = ["alpha", "  beta fee  ", "gamma"]
+    pats = [re.compile(r"fee")]
+    assert find_matches(lines, pats) == find_matches("\n".join(lines), pats)
+
+
+def test_find_matches_one_hit_per_line_and_max_hits():
+    lines = ["fee fee", "fee", "fee"]
+    assert find_matches(lines, [re.compile("fee")], max_hits=2) == ["fee fee fee", "fee fee fee fee"]
+
+
+def test_find_matches_does_not_cross_line_breaks():
+    assert find_matches(["we may", "change terms"], [re.compile(r"may\s+change")]) == []
+    assert find_matches(["a", "b"], [re.compile(r"a.b", re.S)]) == []
+    assert find_matches(["fee ", "x"], [re.compile(r"fee\s\s")]) == []
+    assert find_matches(["x[", "]y"], [re.compile(r"\[[^a]\]")]) == []
+
+
+def test_find_matches_cross_line_candidate_does_not_hide_later_hit():
+    lines = ["we may", "change terms", "we may change fees"]
+    assert find_matches(lines, [re.compile(r"may\s+change")]) == [
+        "change terms we may change fees"
+    ]
+
+
+def test_find_matches_anchors_apply_to_stripped_lines():
+    assert find_matches(["  foo bar"], [re.compile(r"^foo")]) == ["foo bar"]
+    assert find_matches(["foo  "], [re.compile(r"foo$")]) == ["foo"]
+    assert find_matches(["x", "  foo"], [re.compile(r"\Afoo")]) == ["x foo"]
+    assert find_matches(["a", "b"], [re.compile(r"(?<=a\n)b")]) == []
+    assert find_matches(["ab"], [re.compile(r"(?<=a)b")]) == ["ab"]